@@ -14,6 +14,8 @@ Contents
   ee              --- Function for excitatory-excitatory interaction.
   simple_ee       --- Simplified model of excitatory-excitatory interaction.
   cd              --- Function for modeling coincidence detector output.
+  bernoulli_spikes --- Function for generating Bernoulli spike trains.
+  poisson_spikes  --- Function for generating Poisson spike trains.
   __version__     --- cd_network version string.
 
 References
@@ -24,5 +26,6 @@ J Acoust Soc Am. 2009 Mar;125(3):1567-83. doi: 10.1121/1.3068446. PMID: 19275315
 """
 
 from .cells import cd, ee, ei, simple_ee
+from .generate import bernoulli_spikes, poisson_spikes
 from .network import CDNetwork
 from .version import __version__
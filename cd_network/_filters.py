@@ -0,0 +1,45 @@
+"""
+Optional Numba-accelerated linear filtering for the integration kernels.
+
+Numba is an optional dependency; when it is not installed the kernels are
+set to None and callers fall back to scipy.signal.
+"""
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional dependency
+    njit = None
+
+if njit is not None:
+    import numpy as np
+
+    @njit(fastmath=True, cache=True)
+    def lfilter_kernel(b, a, x, out):
+        """
+        Direct form II transposed IIR filter over a 1D signal.
+
+        Matches scipy.signal.lfilter with zero initial conditions: a K-length
+        delay line is carried per sample, with yn = b[0] * xn + z[0] and
+        z[k] = b[k + 1] * xn + z[k + 1] - a[k + 1] * yn. Coefficients must be
+        normalized so a[0] == 1 and b and a padded to equal length.
+        """
+        order = len(b) - 1
+        z = np.zeros(order, dtype=x.dtype)
+        for n in range(len(x)):
+            xn = x[n]
+            yn = b[0] * xn + (z[0] if order > 0 else 0.0)
+            for k in range(order - 1):
+                z[k] = b[k + 1] * xn + z[k + 1] - a[k + 1] * yn
+            if order > 0:
+                z[order - 1] = b[order] * xn - a[order] * yn
+            out[n] = yn
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def lfilter_kernel_2d(b, a, x, out):
+        """Run lfilter_kernel over the rows of a 2D signal in parallel."""
+        for i in prange(x.shape[0]):
+            lfilter_kernel(b, a, x[i], out[i])
+
+else:
+    lfilter_kernel = None
+    lfilter_kernel_2d = None
@@ -0,0 +1,34 @@
+"""
+Optional Numba-accelerated kernels for the cell computations.
+
+Numba is an optional dependency; when it is not installed the kernels are
+set to None and callers fall back to the pure NumPy implementations.
+"""
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is an optional dependency
+    njit = None
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def all_spikes_ee_kernel(inputs, ci, output):
+        """
+        Fused leave-one-out reduction: output[s] = sum_i inputs[i, s] *
+        prod_{j != i} ci[j, s], computed in a single streaming pass over
+        samples with no intermediate arrays.
+        """
+        n_inputs, samples = inputs.shape
+        for s in prange(samples):
+            acc = 0.0
+            for i in range(n_inputs):
+                product = 1.0
+                for j in range(n_inputs):
+                    if j != i:
+                        product *= ci[j, s]
+                acc += inputs[i, s] * product
+            output[s] = acc
+
+else:
+    all_spikes_ee_kernel = None
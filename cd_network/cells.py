@@ -3,9 +3,8 @@ from typing import Optional
 
 import numpy as np
 
-from .coincidence_integral import cached_coincidence_integral, coincidence_integral
-
-EPS = 1e-15
+from ._kernels import all_spikes_ee_kernel
+from .coincidence_integral import coincidence_integral
 
 
 def ei(
@@ -13,30 +12,35 @@ def ei(
     inhibitory_inputs: np.ndarray,
     delta_s: float,
     fs: float,
+    ci: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Computes the output of an excitatory-inhibitory (EI) cell. The EI cell generates a spike
     based on the excitatory input, provided there are no spikes in the inhibitory inputs
     within a specified time window preceding the excitatory spike.
 
+    The excitatory input may also be a 2D batch of signals sharing the same
+    inhibitory inputs; the inhibitory suppression is then computed once and
+    broadcast across the batch.
+
     Parameters:
         excitatory_input (np.ndarray): A 1D or 2D array containing the excitatory input signals.
         inhibitory_inputs (np.ndarray): A 1D or 2D array containing the inhibitory input signals.
         delta_s (float): The duration in seconds of the time window for checking inhibitory spikes.
         fs (float): The sampling frequency in Hz.
+        ci (Optional[np.ndarray]): Precomputed coincidence integral of the inhibitory inputs.
+                                   Computed from inhibitory_inputs when not provided.
 
     Returns:
         np.ndarray: An array representing the output of the EI cell after processing the inputs.
+                    1D for a single excitatory signal, 2D for a batch.
 
     Raises:
         AssertionError: If input dimensions do not meet the required 1D or 2D structure or
                         if the length of excitatory input does not match the length of inhibitory inputs.
     """
     assert excitatory_input.ndim in [1, 2], "Excitatory input must be a 1D or 2D array."
-    if excitatory_input.ndim == 2:
-        assert (
-            excitatory_input.shape[0] == 1
-        ), "If 2D, excitatory input must have a single row."
+    if excitatory_input.ndim == 2 and excitatory_input.shape[0] == 1:
         excitatory_input = excitatory_input[0]
 
     assert inhibitory_inputs.ndim in [
@@ -47,16 +51,29 @@ def ei(
         inhibitory_inputs = inhibitory_inputs[np.newaxis, ...]
 
     assert (
-        len(excitatory_input) == inhibitory_inputs.shape[-1]
+        excitatory_input.shape[-1] == inhibitory_inputs.shape[-1]
     ), "Length of excitatory input must match the size of inhibitory inputs along the last axis."
 
-    output = excitatory_input * np.prod(
-        1 - coincidence_integral(inhibitory_inputs, delta_s, fs), axis=0
-    )
-    return output
+    if ci is None:
+        ci = coincidence_integral(inhibitory_inputs, delta_s, fs)
+
+    # Fuse the (1 - ci) product into one output buffer plus a single scratch
+    # row instead of materializing full-size temporaries for each stage.
+    suppression = np.subtract(1.0, ci[0])
+    scratch = np.empty_like(suppression)
+    for row in ci[1:]:
+        np.subtract(1.0, row, out=scratch)
+        suppression *= scratch
+
+    if excitatory_input.ndim == 1:
+        suppression *= excitatory_input
+        return suppression
+    return excitatory_input * suppression
 
 
-def _all_spikes_ee(inputs: np.ndarray, delta_s: float, fs: float) -> np.ndarray:
+def _all_spikes_ee(
+    inputs: np.ndarray, delta_s: float, fs: float, ci: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     An all-spike EE cell generates a spike whenever all of its inputs spikes during an interval ∆.
 
@@ -64,24 +81,108 @@ def _all_spikes_ee(inputs: np.ndarray, delta_s: float, fs: float) -> np.ndarray:
         inputs (np.ndarray): 2D array of excitatory inputs.
         fs (float): Sampling frequency.
         delta_s: Coincidence integration duration in seconds.
+        ci (Optional[np.ndarray]): Precomputed coincidence integral of the inputs.
 
     Returns:
         np.ndarray: Output after applying the excitatory-excitatory interaction.
     """
     assert inputs.ndim == 2, "Excitatory inputs must be a 2D array."
 
-    coincidence_integral_outputs = cached_coincidence_integral(inputs, delta_s, fs)
-    coincidence_prod = np.prod(coincidence_integral_outputs, axis=0)
+    coincidence_integral_outputs = (
+        ci if ci is not None else coincidence_integral(inputs, delta_s, fs)
+    )
 
     n_inputs, samples = inputs.shape
-    output = np.zeros(samples)
-    for i in range(n_inputs):
-        output += inputs[i] * coincidence_prod / (coincidence_integral_outputs[i] + EPS)
-    return output
+
+    if all_spikes_ee_kernel is not None:
+        output = np.empty(
+            samples,
+            dtype=np.result_type(inputs.dtype, coincidence_integral_outputs.dtype),
+        )
+        all_spikes_ee_kernel(
+            np.ascontiguousarray(inputs),
+            np.ascontiguousarray(coincidence_integral_outputs),
+            output,
+        )
+        return output
+
+    # Leave-one-out products via prefix/suffix cumulative products, avoiding
+    # the division by near-zero integrals that the naive product/divide needs.
+    ones = np.ones((1, samples), dtype=coincidence_integral_outputs.dtype)
+    prefix = np.concatenate(
+        (
+            ones,
+            np.cumprod(coincidence_integral_outputs[:-1], axis=0),
+        ),
+        axis=0,
+    )
+    suffix = np.concatenate(
+        (
+            np.cumprod(coincidence_integral_outputs[:0:-1], axis=0)[::-1],
+            ones,
+        ),
+        axis=0,
+    )
+    return np.einsum("is,is->s", inputs, prefix * suffix)
+
+
+def _combination_masks(n_inputs: int, n_spikes_range) -> np.ndarray:
+    """
+    Enumerate input subsets as one boolean mask matrix.
+
+    Parameters:
+        n_inputs (int): Number of input rows.
+        n_spikes_range: Iterable of subset sizes to enumerate.
+
+    Returns:
+        np.ndarray: Boolean array of shape (n_combinations, n_inputs), one row
+                    per subset with True marking the spiking inputs.
+    """
+    masks = [
+        np.isin(np.arange(n_inputs), comb)
+        for n_spikes in n_spikes_range
+        for comb in combinations(range(n_inputs), n_spikes)
+    ]
+    return np.array(masks, dtype=bool)
+
+
+def _masked_leave_one_out_sum(
+    inputs: np.ndarray, ci: np.ndarray, masks: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the summed EE/EI response of a batch of input subsets.
+
+    For each mask row, spiking inputs contribute their coincidence integral
+    and non-spiking inputs the complement (1 - ci); the leave-one-out products
+    over that weighting, summed against the spiking inputs, give the subset's
+    response. All subsets are reduced in one broadcast instead of a Python
+    loop over combinations.
+
+    Parameters:
+        inputs (np.ndarray): 2D array of excitatory inputs.
+        ci (np.ndarray): Precomputed coincidence integral of the inputs.
+        masks (np.ndarray): Boolean subset masks of shape (n_combinations, n_inputs).
+
+    Returns:
+        np.ndarray: 1D array with the responses summed over all subsets.
+    """
+    _, samples = inputs.shape
+    weights = np.where(masks[:, :, np.newaxis], ci[np.newaxis], 1.0 - ci[np.newaxis])
+
+    ones = np.ones((len(masks), 1, samples), dtype=weights.dtype)
+    prefix = np.concatenate((ones, np.cumprod(weights[:, :-1], axis=1)), axis=1)
+    suffix = np.concatenate(
+        (np.cumprod(weights[:, :0:-1], axis=1)[:, ::-1], ones), axis=1
+    )
+    return np.einsum("cns,cn,ns->s", prefix * suffix, masks, inputs)
 
 
 def _exactly_n_spikes_ee(
-    inputs: np.ndarray, n_spikes: int, delta_s: float, fs: float
+    inputs: np.ndarray,
+    n_spikes: int,
+    delta_s: float,
+    fs: float,
+    ci: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     An all-spikes EE cell generates a spike whenever exactly n_spikes of its inputs spikes during an interval ∆.
@@ -91,6 +192,7 @@ def _exactly_n_spikes_ee(
         n_spikes (int): Exact number of inputs that must spike.
         fs (float): Sampling frequency.
         delta_s: Coincidence integration duration in seconds.
+        ci (Optional[np.ndarray]): Precomputed coincidence integral of the inputs.
 
     Returns:
         np.ndarray: Output after applying the excitatory-excitatory interaction.
@@ -99,30 +201,14 @@ def _exactly_n_spikes_ee(
 
     n_inputs, samples = inputs.shape
     assert (
-        n_inputs <= n_inputs
+        n_spikes <= n_inputs
     ), "n_spikes should be less than or equal to the number of inputs."
 
-    output = np.zeros(samples)
-    binomial_combinations = list(combinations(range(n_inputs), n_spikes))
-
-    for comb in binomial_combinations:
-        indices_spike = np.array(comb)
-        indices_not_spike = np.array(list(set(range(n_inputs)) - set(indices_spike)))
-        if len(indices_not_spike) == 0:
-            output += _all_spikes_ee(
-                inputs=inputs[indices_spike], delta_s=delta_s, fs=fs
-            )
-        else:
-            output += ei(
-                excitatory_input=_all_spikes_ee(
-                    inputs=inputs[indices_spike], delta_s=delta_s, fs=fs
-                ),
-                inhibitory_inputs=inputs[indices_not_spike],
-                delta_s=delta_s,
-                fs=fs,
-            )
+    if ci is None:
+        ci = coincidence_integral(inputs, delta_s, fs)
 
-    return output
+    masks = _combination_masks(n_inputs, (n_spikes,))
+    return _masked_leave_one_out_sum(inputs, ci, masks)
 
 
 def simple_ee(inputs, delta_s: float, fs: float) -> np.ndarray:
@@ -147,7 +233,9 @@ def simple_ee(inputs, delta_s: float, fs: float) -> np.ndarray:
     return _all_spikes_ee(inputs, delta_s, fs)
 
 
-def ee(inputs, n_spikes: int, delta_s: float, fs: float) -> np.ndarray:
+def ee(
+    inputs, n_spikes: int, delta_s: float, fs: float, ci: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     A general EE cell generates a spike whenever at least min_input of its inputs spikes during an interval ∆.
 
@@ -156,6 +244,7 @@ def ee(inputs, n_spikes: int, delta_s: float, fs: float) -> np.ndarray:
         n_spikes (int): Minimum number of inputs that must spike.
         delta_s (float): Coincidence integration duration in seconds.
         fs (float): Sampling frequency.
+        ci (Optional[np.ndarray]): Precomputed coincidence integral of the inputs.
 
     Returns:
         np.ndarray: Output after applying the excitatory-excitatory interaction with the specified criteria.
@@ -168,14 +257,14 @@ def ee(inputs, n_spikes: int, delta_s: float, fs: float) -> np.ndarray:
 
     n_inputs, samples = inputs.shape
     assert (
-        n_inputs <= n_inputs
+        n_spikes <= n_inputs
     ), "n_spikes should be less than or equal to the number of inputs."
 
-    output = np.zeros(samples)
-    for i in range(n_spikes, n_inputs + 1):
-        output += _exactly_n_spikes_ee(inputs, i, delta_s, fs)
+    if ci is None:
+        ci = coincidence_integral(inputs, delta_s, fs)
 
-    return output
+    masks = _combination_masks(n_inputs, range(n_spikes, n_inputs + 1))
+    return _masked_leave_one_out_sum(inputs, ci, masks)
 
 
 def cd(
@@ -227,25 +316,50 @@ def cd(
         inhibitory_samples == excitatory_samples
     ), "Number of samples in inhibitory and excitatory inputs must match."
 
-    output = np.zeros(excitatory_samples)
-    for i in range(min(n_inhibitory_inputs, n_excitatory_inputs - n_spikes) + 1):
-        if i == 0:
-            output += ei(
-                excitatory_input=ee(excitatory_inputs, n_spikes, delta_s, fs),
-                inhibitory_inputs=inhibitory_inputs,
-                delta_s=delta_s,
-                fs=fs,
-            )
-        elif 1 <= i <= min(inhibitory_samples - 1, excitatory_samples - n_spikes):
-            output += ei(
-                excitatory_input=ee(excitatory_inputs, n_spikes + i, delta_s, fs),
-                inhibitory_inputs=_all_spikes_ee(inhibitory_inputs, delta_s, fs),
-                delta_s=delta_s,
-                fs=fs,
-            )
-        elif i == inhibitory_inputs:
-            output += ee(excitatory_inputs, n_spikes + i, delta_s, fs)
-        else:
-            raise Exception("Unexpected case in loop.")
+    excitatory_ci = coincidence_integral(excitatory_inputs, delta_s, fs)
+    inhibitory_ci = coincidence_integral(inhibitory_inputs, delta_s, fs)
+
+    spike_excess_max = min(n_inhibitory_inputs, n_excitatory_inputs - n_spikes)
+
+    output = np.zeros(
+        excitatory_samples, dtype=np.result_type(excitatory_ci, inhibitory_ci)
+    )
+    if spike_excess_max >= 0:
+        output += ei(
+            excitatory_input=ee(
+                excitatory_inputs, n_spikes, delta_s, fs, ci=excitatory_ci
+            ),
+            inhibitory_inputs=inhibitory_inputs,
+            delta_s=delta_s,
+            fs=fs,
+            ci=inhibitory_ci,
+        )
+
+    # All intermediate spike-excess terms share the same inhibitory all-spikes
+    # signal, so stack them and suppress the whole batch with one ei call.
+    intermediate = [
+        ee(excitatory_inputs, n_spikes + i, delta_s, fs, ci=excitatory_ci)
+        for i in range(1, min(spike_excess_max, n_inhibitory_inputs - 1) + 1)
+    ]
+    if intermediate:
+        suppressed = ei(
+            excitatory_input=np.stack(intermediate),
+            inhibitory_inputs=_all_spikes_ee(
+                inhibitory_inputs, delta_s, fs, ci=inhibitory_ci
+            ),
+            delta_s=delta_s,
+            fs=fs,
+        )
+        output += suppressed if suppressed.ndim == 1 else suppressed.sum(axis=0)
+
+    if 1 <= n_inhibitory_inputs <= spike_excess_max:
+        # Terminal term: every inhibitory input spiked.
+        output += ee(
+            excitatory_inputs,
+            n_spikes + n_inhibitory_inputs,
+            delta_s,
+            fs,
+            ci=excitatory_ci,
+        )
 
     return output
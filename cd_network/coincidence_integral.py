@@ -1,25 +1,40 @@
 from functools import lru_cache
-from typing import Callable
+from typing import Callable, Optional
 
 import numpy as np
-from scipy import signal
 
-from .utils import hashable_input
+from ._filters import lfilter_kernel, lfilter_kernel_2d
 
+# scipy is imported lazily inside the functions that need it: the default
+# cumsum/cumtrapz paths are pure numpy, so importing cd_network does not pay
+# the scipy import cost unless a scipy-backed method is actually used.
 
+
+@lru_cache(maxsize=16)
 def create_trapezoid_kernel(samples_integral: int) -> np.ndarray:
     """
     Create a trapezoidal kernel for signal integration.
 
+    The kernel only depends on the window length, so it is memoized across
+    the many coincidence_integral calls issued by a single cell evaluation.
+
     Parameters:
         samples_integral (int): Number of samples over which to integrate.
 
     Returns:
         np.ndarray: The trapezoidal kernel.
     """
-    return np.concatenate(([0], np.ones(samples_integral - 1))) + np.concatenate(
-        (np.ones(samples_integral - 1), [0])
-    )
+    if samples_integral == 1:
+        # A one-sample window spans zero width, so its trapezoid integral is
+        # identically zero; the general fill below would wrongly yield [1.0].
+        kernel = np.zeros(1)
+    else:
+        kernel = np.full(samples_integral, 2.0)
+        kernel[0] = 1.0
+        kernel[-1] = 1.0
+    # The cached array is shared between callers; freeze it against aliasing.
+    kernel.setflags(write=False)
+    return kernel
 
 
 def apply_filter(
@@ -37,46 +52,274 @@ def apply_filter(
     Returns:
         np.ndarray: The filtered signal.
     """
-    return filter_func(kernel, 1, x) * dt / 2
+    from scipy import signal
 
+    if filter_func is signal.lfilter and lfilter_kernel is not None and x.ndim <= 2:
+        return _numba_lfilter(x, kernel, dt)
+    if filter_func is signal.filtfilt:
+        # filtfilt's default edge padding of 3 * len(kernel) samples raises on
+        # signals shorter than the pad and wastes work on long kernels; cap it
+        # to what the signal can support.
+        padlen = min(3 * len(kernel), x.shape[-1] - 1)
+        output = filter_func(kernel, 1, x, axis=-1, padlen=padlen)
+    else:
+        output = filter_func(kernel, 1, x, axis=-1)
+    output *= dt / 2
+    return output
 
-def coincidence_integral(
-    x: np.ndarray, integration_duration: float, fs: float, method: str = "filtfilt"
+
+def _numba_lfilter(x: np.ndarray, kernel: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Causal filtering through the compiled direct form II transposed loop.
+
+    Only used when numba is installed; matches scipy.signal.lfilter with
+    zero initial conditions, with the 2D case parallelized across rows.
+    """
+    dtype = np.result_type(x, kernel, np.float64)
+    x = np.ascontiguousarray(x, dtype=dtype)
+    b = np.ascontiguousarray(kernel, dtype=dtype)
+    a = np.zeros_like(b)
+    a[0] = 1.0
+    output = np.empty_like(x)
+    if x.ndim == 1:
+        lfilter_kernel(b, a, x, output)
+    else:
+        lfilter_kernel_2d(b, a, x, output)
+    output *= dt / 2
+    return output
+
+
+def causal_fir_integral(x: np.ndarray, kernel: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Apply the trapezoidal kernel as a causal FIR filter.
+
+    For short kernels this is a direct lfilter; for long kernels an
+    overlap-add FFT convolution truncated to the input length computes the
+    same causal result in O(N log K) instead of O(N * K).
+
+    Parameters:
+        x (np.ndarray): The input signal.
+        kernel (np.ndarray): The filter kernel.
+        dt (float): The time step.
+
+    Returns:
+        np.ndarray: The filtered signal.
+    """
+    from scipy import signal
+
+    if len(kernel) <= 64:
+        return apply_filter(x, kernel, dt, signal.lfilter)
+    kernel = kernel if x.ndim == 1 else kernel[np.newaxis, ...]
+    output = signal.oaconvolve(x, kernel, mode="full", axes=-1)
+    return output[..., : x.shape[-1]] * dt / 2
+
+
+def running_trapezoid_integral(
+    x: np.ndarray, samples_integral: int, dt: float
 ) -> np.ndarray:
     """
-    Computes the coincidence integral of the input signal.
+    Compute the causal trapezoid running integral with a cumulative sum.
+
+    Equivalent to convolving with the trapezoidal kernel, but O(N) per row
+    regardless of the window width: the windowed sum is the difference of two
+    cumulative sums, with half-weight corrections at the window endpoints.
 
     Parameters:
         x (np.ndarray): The input signal.
-        integration_duration (float): The duration over which to integrate.
-        fs (float): The sampling frequency.
-        method (str): The method for integration ('filtfilt', 'lfilter', 'cumtrapz').
+        samples_integral (int): Number of samples over which to integrate.
+        dt (float): The time step.
 
     Returns:
-        np.ndarray: The coincidence integral of the signal.
+        np.ndarray: The running trapezoid integral of the signal.
     """
-    dt = 1 / fs
-    samples_integral = int(np.floor(integration_duration * fs))
-    kernel = create_trapezoid_kernel(samples_integral)
+    x = np.asarray(x)
+    num_samples = x.shape[-1]
+    cumulative = np.cumsum(x, axis=-1)
+    output = cumulative - 0.5 * x
+    output[..., samples_integral:] -= cumulative[..., :-samples_integral]
+    output[..., samples_integral - 1 :] -= (
+        0.5 * x[..., : num_samples - (samples_integral - 1)]
+    )
+    return output * dt
 
-    filter_methods = {
-        "filtfilt": lambda x: apply_filter(x, kernel, dt, signal.filtfilt),
-        "lfilter": lambda x: apply_filter(x, kernel, dt, signal.lfilter),
-    }
-    if method in filter_methods:
-        return filter_methods[method](x)
 
-    raise ValueError(f"method {method} is not supported.")
+def running_sum_integral(x: np.ndarray, samples_integral: int, dt: float) -> np.ndarray:
+    """
+    Compute the running trapezoid integral with a two-tap IIR running sum.
 
+    The windowed sum y[n] = y[n-1] + x[n] - x[n-K] costs O(N) independent of
+    the window width; the trapezoid endpoint weighting is restored with the
+    same half-sample corrections as the cumsum formulation.
 
-@lru_cache(maxsize=None)
-def cached_coincidence_integral_computation(inputs_tuple, delta_s, fs):
-    """Cached version of the coincidence_integral computation, uses hashable input."""
-    inputs = np.array(inputs_tuple)  # Convert tuple back to numpy array
-    return coincidence_integral(inputs, delta_s, fs)
+    Parameters:
+        x (np.ndarray): The input signal.
+        samples_integral (int): Number of samples over which to integrate.
+        dt (float): The time step.
 
+    Returns:
+        np.ndarray: The running trapezoid integral of the signal.
+    """
+    from scipy import signal
 
-def cached_coincidence_integral(inputs, delta_s, fs):
-    """Prepare the input for caching and call the cached computation."""
-    inputs_tuple = hashable_input(inputs)
-    return cached_coincidence_integral_computation(inputs_tuple, delta_s, fs)
+    x = np.asarray(x)
+    num_samples = x.shape[-1]
+    b = np.zeros(samples_integral + 1)
+    b[0] = 1.0
+    b[-1] = -1.0
+    a = np.array([1.0, -1.0])
+    output = signal.lfilter(b, a, x)
+    output -= 0.5 * x
+    output[..., samples_integral - 1 :] -= (
+        0.5 * x[..., : num_samples - (samples_integral - 1)]
+    )
+    return output * dt
+
+
+def uniform_filter_integral(
+    x: np.ndarray, samples_integral: int, dt: float
+) -> np.ndarray:
+    """
+    Approximate the coincidence integral with a zero-phase running mean.
+
+    scipy.ndimage's C-implemented uniform filter computes a centered boxcar
+    mean in O(N); rescaled by the window duration it gives a non-causal
+    (zero-phase) rectangle-rule integral, useful when the symmetric window
+    of the original filtfilt behaviour is wanted.
+
+    Parameters:
+        x (np.ndarray): The input signal.
+        samples_integral (int): Number of samples over which to integrate.
+        dt (float): The time step.
+
+    Returns:
+        np.ndarray: The zero-phase running integral of the signal.
+    """
+    from scipy.ndimage import uniform_filter1d
+
+    x = np.asarray(x, dtype=np.result_type(x, np.float32))
+    output = uniform_filter1d(x, size=samples_integral, axis=-1, mode="constant")
+    return output * (samples_integral * dt)
+
+
+def iir_integrator_integral(
+    x: np.ndarray, samples_integral: int, dt: float
+) -> np.ndarray:
+    """
+    Approximate the windowed integral with a single-pole leaky integrator.
+
+    y[n] = (1 - dt / tau) * y[n-1] + dt * x[n] with tau set to the window
+    duration: the hard integration window becomes an exponential one with the
+    same DC gain, at a constant per-sample cost independent of the window
+    width. Applied through sosfilt's second-order-section path.
+
+    Parameters:
+        x (np.ndarray): The input signal.
+        samples_integral (int): Number of samples over which to integrate.
+        dt (float): The time step.
+
+    Returns:
+        np.ndarray: The leaky running integral of the signal.
+    """
+    from scipy import signal
+
+    tau = samples_integral * dt
+    sos = signal.tf2sos([dt], [1.0, -(1.0 - dt / tau)])
+    return signal.sosfilt(sos, x, axis=-1)
+
+
+def running_cumtrapz_integral(
+    x: np.ndarray, samples_integral: int, dt: float
+) -> np.ndarray:
+    """
+    Compute the running trapezoid integral from the cumulative trapezoid rule.
+
+    The windowed integral is the cumulative integral minus its value one
+    window earlier, so the whole 2D array is handled by one cumulative sum
+    over the trapezoid increments and one shifted subtraction. The cumulative
+    integral is built directly in numpy (matching
+    scipy.integrate.cumulative_trapezoid with initial=0) to keep this path
+    free of scipy call overhead.
+
+    Parameters:
+        x (np.ndarray): The input signal.
+        samples_integral (int): Number of samples over which to integrate.
+        dt (float): The time step.
+
+    Returns:
+        np.ndarray: The running trapezoid integral of the signal.
+    """
+    x = np.asarray(x)
+    increments = (x[..., 1:] + x[..., :-1]) * (0.5 * dt)
+    cumulative = np.zeros(x.shape, dtype=increments.dtype)
+    np.cumsum(increments, axis=-1, out=cumulative[..., 1:])
+    shift = samples_integral - 1
+    if shift == 0:
+        # A one-sample window spans zero width; its integral is zero.
+        return np.zeros_like(cumulative)
+    output = cumulative.copy()
+    output[..., shift:] -= cumulative[..., :-shift]
+    return output
+
+
+def _causal_fir_method(x: np.ndarray, samples_integral: int, dt: float) -> np.ndarray:
+    return causal_fir_integral(x, create_trapezoid_kernel(samples_integral), dt)
+
+
+# Module-level dispatch table shared by all coincidence_integral calls; every
+# implementation takes (x, samples_integral, dt).
+_METHODS = {
+    "cumsum": running_trapezoid_integral,
+    "filtfilt": running_trapezoid_integral,
+    "lfilter": _causal_fir_method,
+    "cumtrapz": running_cumtrapz_integral,
+    "running_sum": running_sum_integral,
+    "uniform": uniform_filter_integral,
+    "iir_integrator": iir_integrator_integral,
+}
+
+
+@lru_cache(maxsize=64)
+def _get_impl(method: str, integration_duration: float, fs: float) -> Callable:
+    """
+    Resolve a (method, duration, fs) triple to a one-argument callable.
+
+    Real pipelines reuse the same integration settings across many calls;
+    memoizing the resolved implementation with its window length and time
+    step folded in skips the dispatch and the floor/int conversion on every
+    call after the first.
+    """
+    dt = 1 / fs
+    samples_integral = int(np.floor(integration_duration * fs))
+    try:
+        implementation = _METHODS[method]
+    except KeyError:
+        raise ValueError(f"method {method} is not supported.")
+    return lambda x: implementation(x, samples_integral, dt)
+
+
+def coincidence_integral(
+    x: np.ndarray,
+    integration_duration: float,
+    fs: float,
+    method: str = "cumsum",
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    """
+    Computes the coincidence integral of the input signal.
+
+    Parameters:
+        x (np.ndarray): The input signal.
+        integration_duration (float): The duration over which to integrate.
+        fs (float): The sampling frequency.
+        method (str): The method for integration ('cumsum', 'filtfilt', 'lfilter', 'cumtrapz', 'running_sum', 'uniform', 'iir_integrator').
+        dtype (Optional[np.dtype]): Working dtype for the integration. The input
+                                    dtype is preserved when not provided; pass
+                                    np.float32 to halve memory traffic when
+                                    double precision is not required.
+
+    Returns:
+        np.ndarray: The coincidence integral of the signal.
+    """
+    if dtype is not None:
+        x = np.asarray(x, dtype=dtype)
+    return _get_impl(method, integration_duration, fs)(x)
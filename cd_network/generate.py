@@ -0,0 +1,57 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+def bernoulli_spikes(
+    p: float,
+    size: Union[int, Tuple[int, ...]],
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Generate a 0/1 spike train with independent Bernoulli(p) samples.
+
+    Uses numpy's Generator API, which draws Bernoulli samples in a single
+    vectorized pass instead of the much slower np.random.choice path.
+
+    Parameters:
+        p (float): Probability of a spike per sample.
+        size (int or tuple): Output shape, e.g. (n_channels, n_samples).
+        rng (Optional[np.random.Generator]): Source of randomness. A fresh
+                                             default_rng() is used when not
+                                             provided.
+
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s with the requested shape.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    return (rng.random(size) < p).astype(np.uint8)
+
+
+def poisson_spikes(
+    rate: float,
+    fs: float,
+    duration: float,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Generate a 0/1 spike train from a homogeneous Poisson process.
+
+    Each sample spikes independently with probability rate / fs, the
+    first-order Bernoulli approximation of a Poisson process sampled at fs
+    (valid while rate is well below fs).
+
+    Parameters:
+        rate (float): Mean firing rate in spikes per second.
+        fs (float): The sampling frequency in Hz.
+        duration (float): Length of the spike train in seconds.
+        rng (Optional[np.random.Generator]): Source of randomness. A fresh
+                                             default_rng() is used when not
+                                             provided.
+
+    Returns:
+        np.ndarray: uint8 array of 0s and 1s of length floor(duration * fs).
+    """
+    num_samples = int(np.floor(duration * fs))
+    return bernoulli_spikes(rate / fs, num_samples, rng=rng)
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def validate_inputs(inputs, expected_dims, var_name="input"):
     """
     Validates the dimensions of the input array against a set of expected dimensions.
@@ -22,12 +25,17 @@ def validate_inputs(inputs, expected_dims, var_name="input"):
 
 def hashable_input(inputs):
     """
-    Converts a 2D array into a hashable tuple format to allow it to be used as a dictionary key or stored in sets.
+    Converts an array into a hashable key to allow it to be used as a dictionary key or stored in sets.
+
+    The raw buffer is hashed via tobytes(), which is a single memcpy instead
+    of boxing every element into a Python object; shape and dtype are included
+    so arrays with identical bytes but different layouts do not collide.
 
     Parameters:
-        inputs (np.ndarray): The 2D input array to be converted.
+        inputs (np.ndarray): The input array to be converted.
 
     Returns:
-        tuple: A tuple of tuples, where each inner tuple represents a row from the input array.
+        tuple: A (shape, dtype, bytes) tuple uniquely describing the array contents.
     """
-    return tuple(map(tuple, inputs))
+    contiguous = np.ascontiguousarray(inputs)
+    return contiguous.shape, contiguous.dtype.str, contiguous.tobytes()
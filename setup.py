@@ -35,5 +35,7 @@ setuptools.setup(
     extras_require={
         "dev": ["pytest", "check-manifest", "pre-commit"],
         "test": ["pytest", "coverage"],
+        "numba": ["numba"],
+        "orjson": ["orjson"],
     },
 )
@@ -12,14 +12,27 @@ class TestNeuralFunctions(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        np.random.seed(42)  # for reproducibility
+        # Generate the fixtures once for the whole class; setUp only binds
+        # them, so each test sees identical deterministic inputs without
+        # re-drawing multi-MB arrays per test method.
+        rng = np.random.default_rng(42)  # for reproducibility
+        cls._excitatory_input = rng.integers(
+            0, 2, size=cls.INPUT_LENGTH, dtype=np.uint8
+        )
+        cls._inhibitory_input = rng.integers(
+            0, 2, size=cls.INPUT_LENGTH, dtype=np.uint8
+        )
+        cls._inputs = rng.integers(
+            0, 2, size=(cls.NUM_INPUT_CHANNELS, cls.INPUT_LENGTH), dtype=np.uint8
+        )
+        cls._inhibitory_inputs = rng.integers(
+            0, 2, size=(cls.NUM_INPUT_CHANNELS, cls.INPUT_LENGTH), dtype=np.uint8
+        )
 
     def setUp(self):
-        self.excitatory_input = np.random.choice([0, 1], size=self.INPUT_LENGTH)
-        self.inhibitory_input = np.random.choice([0, 1], size=self.INPUT_LENGTH)
-        self.inputs = np.random.choice(
-            [0, 1], size=(self.NUM_INPUT_CHANNELS, self.INPUT_LENGTH)
-        )
+        self.excitatory_input = self._excitatory_input
+        self.inhibitory_input = self._inhibitory_input
+        self.inputs = self._inputs
         self.delta_s = 0.1  # 100 ms
         self.fs = 16000  # 16000 Hz
 
@@ -47,6 +60,14 @@ class TestNeuralFunctions(unittest.TestCase):
             "Output shape mismatch for _exactly_n_spikes_ee function.",
         )
 
+    def test_exactly_n_spikes_ee_all_inputs_boundary(self):
+        """Test that exactly-n with n equal to the input count reduces to the all-spikes cell."""
+        result = _exactly_n_spikes_ee(
+            self.inputs, self.NUM_INPUT_CHANNELS, self.delta_s, self.fs
+        )
+        expected = _all_spikes_ee(self.inputs, self.delta_s, self.fs)
+        np.testing.assert_allclose(result, expected)
+
     def test_simple_ee_output_shape(self):
         result = simple_ee(self.inputs, self.delta_s, self.fs)
         self.assertEqual(
@@ -64,10 +85,7 @@ class TestNeuralFunctions(unittest.TestCase):
         )
 
     def test_cd_output_shape(self):
-        inhibitory_inputs = np.random.choice(
-            [0, 1], size=(self.NUM_INPUT_CHANNELS, self.INPUT_LENGTH)
-        )
-        result = cd(self.inputs, inhibitory_inputs, 1, self.delta_s, self.fs)
+        result = cd(self.inputs, self._inhibitory_inputs, 1, self.delta_s, self.fs)
         self.assertEqual(
             result.shape,
             (self.OUTPUT_LENGTH,),
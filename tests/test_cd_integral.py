@@ -34,11 +34,26 @@ class TestCoincidenceIntegration(unittest.TestCase):
         x = np.random.randn(3, 100)
         integration_duration = 1
         fs = 5  # sample frequency
-        methods = ["filtfilt", "lfilter"]
+        methods = [
+            "cumsum",
+            "filtfilt",
+            "lfilter",
+            "cumtrapz",
+            "running_sum",
+            "uniform",
+            "iir_integrator",
+        ]
         for method in methods:
             result = coincidence_integral(x, integration_duration, fs, method)
             self.assertEqual(result.shape, x.shape)
 
+    def test_cumsum_matches_lfilter(self):
+        """Test that the cumsum running integral matches the trapezoid FIR."""
+        x = np.random.randn(3, 200)
+        result_cumsum = coincidence_integral(x, 0.5, 10, method="cumsum")
+        result_lfilter = coincidence_integral(x, 0.5, 10, method="lfilter")
+        np.testing.assert_allclose(result_cumsum, result_lfilter)
+
 
 if __name__ == "__main__":
     unittest.main()